@@ -6,27 +6,32 @@ import matplotlib.pyplot as plt
 import os
 from collections import deque
 import heapq
+import numpy as np
+from grid import Grid, as_grid
+from sweep_scheduler import run_sweep, CENSORED
+from sparse_solver import sparse_best_paths
 
 sys.setrecursionlimit(1000000)  # Increase recursion limit if necessary
 
 def generate_grid(n, obstacle_density):
     total_cells = n * n
     total_obstacles = int(total_cells * obstacle_density)
-    grid = [[0 for _ in range(n)] for _ in range(n)]
-    positions = [(i, j) for i in range(n) for j in range(n)]
-    positions.remove((0, 0))
-    positions.remove((n - 1, n - 1))
+    grid = Grid(n)
+    # Flat indices of every cell except the start and end, without building
+    # n*n coordinate tuples for the large sweep sizes
+    positions = range(1, total_cells - 1)
     max_obstacles = len(positions)
     if total_obstacles > max_obstacles:
         total_obstacles = max_obstacles
     obstacle_positions = random.sample(positions, total_obstacles)
     for pos in obstacle_positions:
-        grid[pos[0]][pos[1]] = -1
+        grid.cells[pos] = 1
     return grid
 
 # Recursive Method
 def recursive_paths(grid, x, y, dir_prev, turns, min_turns, memo):
-    n = len(grid)
+    n = grid.n
+    cells = grid.cells
     if (x, y, dir_prev, turns) in memo:
         return memo[(x, y, dir_prev, turns)]
     if x == n - 1 and y == n - 1:
@@ -43,7 +48,7 @@ def recursive_paths(grid, x, y, dir_prev, turns, min_turns, memo):
     directions = [("right", 0, 1), ("down", 1, 0)]
     for dir_new, dx, dy in directions:
         nx, ny = x + dx, y + dy
-        if 0 <= nx < n and 0 <= ny < n and grid[nx][ny] != -1:
+        if 0 <= nx < n and 0 <= ny < n and not cells[nx * n + ny]:
             if dir_prev is None:
                 new_turns = turns
             elif dir_prev != dir_new:
@@ -55,8 +60,10 @@ def recursive_paths(grid, x, y, dir_prev, turns, min_turns, memo):
     return total_paths
 
 def count_best_paths_recursive(grid):
-    n = len(grid)
-    if grid[0][0] == -1 or grid[n - 1][n - 1] == -1:
+    grid = as_grid(grid)
+    n = grid.n
+    cells = grid.cells
+    if cells[0] or cells[n * n - 1]:
         return None, None
     min_turns = [float('inf')]
     memo = {}
@@ -70,8 +77,10 @@ def count_best_paths_recursive(grid):
 
 # Dynamic Programming Method
 def count_best_paths_dp(grid):
-    n = len(grid)
-    if grid[0][0] == -1 or grid[n - 1][n - 1] == -1:
+    grid = as_grid(grid)
+    n = grid.n
+    cells = grid.cells
+    if cells[0] or cells[n * n - 1]:
         return 0, None
     dp = [[[float('inf')] * 2 for _ in range(n)] for _ in range(n)]
     paths = [[[0] * 2 for _ in range(n)] for _ in range(n)]
@@ -79,7 +88,7 @@ def count_best_paths_dp(grid):
     # Start from (0, 0), with initial directions
     for dir_new_idx, (dir_new, dx, dy) in enumerate([("right", 0, 1), ("down", 1, 0)]):
         nx, ny = dx, dy
-        if 0 <= nx < n and 0 <= ny < n and grid[nx][ny] != -1:
+        if 0 <= nx < n and 0 <= ny < n and not cells[nx * n + ny]:
             dp[nx][ny][dir_new_idx] = 0
             paths[nx][ny][dir_new_idx] = 1
             queue.append((nx, ny, dir_new_idx, 0))
@@ -92,7 +101,7 @@ def count_best_paths_dp(grid):
         directions = [("right", 0, 1), ("down", 1, 0)]
         for dir_new_idx, (dir_new, dx, dy) in enumerate(directions):
             nx, ny = x + dx, y + dy
-            if 0 <= nx < n and 0 <= ny < n and grid[nx][ny] != -1:
+            if 0 <= nx < n and 0 <= ny < n and not cells[nx * n + ny]:
                 if dir_prev != dir_new_idx:
                     new_turns = turns + 1
                 else:
@@ -123,8 +132,10 @@ def count_best_paths_combinatorial(n):
 
 # Dijkstra's Algorithm Method (minimizing number of turns)
 def count_best_paths_dijkstra(grid):
-    n = len(grid)
-    if grid[0][0] == -1 or grid[n - 1][n - 1] == -1:
+    grid = as_grid(grid)
+    n = grid.n
+    cells = grid.cells
+    if cells[0] or cells[n * n - 1]:
         return 0, None
     # Directions: 0 - right, 1 - down
     directions = [("right", 0, 1), ("down", 1, 0)]
@@ -132,7 +143,7 @@ def count_best_paths_dijkstra(grid):
     # Initialize heap with possible starting directions
     for dir_idx, (dir_name, dx, dy) in enumerate(directions):
         nx, ny = dx, dy
-        if 0 <= nx < n and 0 <= ny < n and grid[nx][ny] != -1:
+        if 0 <= nx < n and 0 <= ny < n and not cells[nx * n + ny]:
             heapq.heappush(heap, (0, nx, ny, dir_idx))
     # Initialize DP tables
     min_turns = [[ [float('inf')] * 2 for _ in range(n)] for _ in range(n)]
@@ -140,7 +151,7 @@ def count_best_paths_dijkstra(grid):
     # Set initial states
     for dir_idx, (dir_name, dx, dy) in enumerate(directions):
         nx, ny = dx, dy
-        if 0 <= nx < n and 0 <= ny < n and grid[nx][ny] != -1:
+        if 0 <= nx < n and 0 <= ny < n and not cells[nx * n + ny]:
             min_turns[nx][ny][dir_idx] = 0
             path_counts[nx][ny][dir_idx] = 1
     while heap:
@@ -150,7 +161,7 @@ def count_best_paths_dijkstra(grid):
             continue
         for new_dir_idx, (dir_new, dx, dy) in enumerate(directions):
             nx, ny = x + dx, y + dy
-            if 0 <= nx < n and 0 <= ny < n and grid[nx][ny] != -1:
+            if 0 <= nx < n and 0 <= ny < n and not cells[nx * n + ny]:
                 if new_dir_idx != dir_prev:
                     new_turns = turns + 1
                 else:
@@ -174,69 +185,94 @@ def count_best_paths_dijkstra(grid):
         return 0, None
     return total_paths, final_min_turns
 
-def algo_compare_main():
-    import time
-    random.seed(11505050)
+# Solvers timed by the sweep, looked up by name inside the worker processes
+def time_combinatorial(grid):
+    return count_best_paths_combinatorial(grid.n)
+
+def sparse_input(grid):
+    # The sparse solver works from the obstacle coordinates alone
+    rows, cols = np.nonzero(grid.view())
+    return grid.n, list(zip(rows.tolist(), cols.tolist()))
+
+METHOD_SOLVERS = {
+    'Recursive': count_best_paths_recursive,
+    'Dynamic Prog.': count_best_paths_dp,
+    'Combinatorial': time_combinatorial,
+    'Dijkstra': count_best_paths_dijkstra,
+    'Sparse': sparse_best_paths,
+}
+
+# Builds a method's arguments from the grid, outside the timed region, for
+# solvers that take something other than the grid itself
+METHOD_INPUTS = {'Sparse': sparse_input}
+
+# Per-method budgets for a single (n, density) cell
+TIME_BUDGETS = {'Recursive': 60, 'Dynamic Prog.': 120, 'Combinatorial': 10, 'Dijkstra': 120, 'Sparse': 120}  # Seconds
+MEMORY_BUDGETS = {method: 4 * 1024 ** 3 for method in METHOD_SOLVERS}  # Bytes of address space
+
+def time_method(method, n, density, seed):
+    """
+    Worker body for one sweep cell. The grid is regenerated from the seed of
+    its (n, density) pair, so every method is timed on the same grid.
+    """
+    random.seed(seed)
+    grid = generate_grid(n, density) if density > 0 else Grid(n)  # Obstacle-free grids need no sampling
+    args = METHOD_INPUTS[method](grid) if method in METHOD_INPUTS else (grid,)
+    start_time = time.time()
+    METHOD_SOLVERS[method](*args)
+    return time.time() - start_time
+
+def algo_compare_main(workers=None):
     save_folder = 'result_images'
     if not os.path.exists(save_folder):
         os.makedirs(save_folder)
-    grid_sizes = [10, 50, 100, 200, 300, 400, 500, 600]  # Adjusted for demonstration
+    grid_sizes = [10, 50, 100, 200, 300, 400, 500, 600, 1000, 2000, 5000]
     obstacle_densities = [0.0, 0.1, 0.3, 0.5]
-    methods = ['Recursive', 'Dynamic Prog.', 'Combinatorial', 'Dijkstra']
+    methods = ['Recursive', 'Dynamic Prog.', 'Combinatorial', 'Dijkstra', 'Sparse']
+
+    # One grid seed per (n, density), shared by every method
+    seeder = random.Random(11505050)
+    seeds = {(n, density): seeder.getrandbits(32) for n in grid_sizes for density in obstacle_densities}
+    cells = [(method, n, density, seeds[(n, density)])
+             for n in grid_sizes for density in obstacle_densities for method in methods
+             if method != 'Combinatorial' or density == 0.0]  # Combinatorial only applies without obstacles
+
+    # Each cell runs in its own process within its method's budgets; a method
+    # stops escalating n once it is censored
+    cell_results = run_sweep(time_method, cells, TIME_BUDGETS, MEMORY_BUDGETS, workers)
 
     # Data structures to store results
-    results = {method: {density: {'sizes': [], 'times': []} for density in obstacle_densities} for method in methods}
+    results = {method: {density: {'sizes': [], 'times': [], 'censored': []} for density in obstacle_densities} for method in methods}
 
-    print(f"{'Grid Size':<10} {'Density':<10} {'Method':<15} {'Time (s)':<10}")
-    print("-" * 50)
+    print(f"{'Grid Size':<10} {'Density':<10} {'Method':<15} {'Time (s)':<10} {'Peak RSS (MiB)':<15}")
+    print("-" * 66)
 
     for n in grid_sizes:
         for density in obstacle_densities:
-            grid = generate_grid(n, density)
-
-            # Recursive Method
-            if n <= 1000:  # Limit recursive method to smaller grids to prevent excessive computation
-                start_time = time.time()
-                _, _ = count_best_paths_recursive(grid)
-                time_rec = time.time() - start_time
-                results['Recursive'][density]['sizes'].append(n)
-                results['Recursive'][density]['times'].append(time_rec)
-                print(f"{n:<10} {density:<10} {'Recursive':<15} {time_rec:<10.4f}")
-            else:
-                print(f"{n:<10} {density:<10} {'Recursive':<15} {'N/A':<10}")
-
-            # Dynamic Programming Method
-            start_time = time.time()
-            _, _ = count_best_paths_dp(grid)
-            time_dp = time.time() - start_time
-            results['Dynamic Prog.'][density]['sizes'].append(n)
-            results['Dynamic Prog.'][density]['times'].append(time_dp)
-            print(f"{n:<10} {density:<10} {'Dynamic Prog.':<15} {time_dp:<10.4f}")
-
-            # Combinatorial Method (only applicable without obstacles)
-            if density == 0.0:
-                start_time = time.time()
-                _, _ = count_best_paths_combinatorial(n)
-                time_comb = time.time() - start_time
-                results['Combinatorial'][density]['sizes'].append(n)
-                results['Combinatorial'][density]['times'].append(time_comb)
-                print(f"{n:<10} {density:<10} {'Combinatorial':<15} {time_comb:<10.4f}")
-            else:
-                print(f"{n:<10} {density:<10} {'Combinatorial':<15} {'N/A':<10}")
-
-            # Dijkstra's Method
-            start_time = time.time()
-            _, _ = count_best_paths_dijkstra(grid)
-            time_dijkstra = time.time() - start_time
-            results['Dijkstra'][density]['sizes'].append(n)
-            results['Dijkstra'][density]['times'].append(time_dijkstra)
-            print(f"{n:<10} {density:<10} {'Dijkstra':<15} {time_dijkstra:<10.4f}")
+            for method in methods:
+                outcome = cell_results.get((method, n, density, seeds[(n, density)]))
+                if outcome is None:
+                    print(f"{n:<10} {density:<10} {method:<15} {'N/A':<10} {'N/A':<15}")
+                    continue
+                peak_rss = f"{outcome.peak_rss / 2**20:.1f}" if outcome.peak_rss is not None else 'N/A'
+                if outcome.status == 'ok':
+                    results[method][density]['sizes'].append(n)
+                    results[method][density]['times'].append(outcome.value)
+                    print(f"{n:<10} {density:<10} {method:<15} {outcome.value:<10.4f} {peak_rss:<15}")
+                else:
+                    if outcome.status in CENSORED:
+                        results[method][density]['censored'].append(n)
+                    row = f"{n:<10} {density:<10} {method:<15} {outcome.status.upper():<10} {peak_rss:<15}"
+                    if outcome.status == 'error':
+                        row += f" {outcome.value}"  # The solver's exception
+                    print(row)
 
     # Plotting execution times for all methods and densities in the same image
     plt.figure(figsize=(14, 8))
-    markers = {'Recursive': 'o', 'Dynamic Prog.': 's', 'Combinatorial': '^', 'Dijkstra': 'D'}
+    markers = {'Recursive': 'o', 'Dynamic Prog.': 's', 'Combinatorial': '^', 'Dijkstra': 'D', 'Sparse': 'v'}
     linestyles = ['-', '--', '-.', ':']
     colors = ['blue', 'green', 'red', 'purple', 'orange', 'cyan']
+    censored_label_added = False  # Flag to track if 'Censored' label has been added
     for method_idx, method in enumerate(methods):
         for density_idx, density in enumerate(obstacle_densities):
             sizes = results[method][density]['sizes']
@@ -246,6 +282,15 @@ def algo_compare_main():
                 linestyle = linestyles[density_idx % len(linestyles)]
                 color = colors[method_idx % len(colors)]
                 plt.plot(sizes, times, marker=markers.get(method, 'o'), linestyle=linestyle, color=color, label=label)
+            # Mark timeouts/OOMs at the method's time budget
+            censored = results[method][density]['censored']
+            if censored:
+                color = colors[method_idx % len(colors)]
+                if not censored_label_added:
+                    plt.scatter(censored, [TIME_BUDGETS[method]] * len(censored), color=color, marker='x', s=100, label='Censored (over budget)')
+                    censored_label_added = True
+                else:
+                    plt.scatter(censored, [TIME_BUDGETS[method]] * len(censored), color=color, marker='x', s=100)
     plt.title('Execution Time vs Grid Size for All Methods and Densities', fontsize=16)
     plt.xlabel('Grid Size (n)', fontsize=14)
     plt.ylabel('Execution Time (s)', fontsize=14)
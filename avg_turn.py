@@ -1,8 +1,11 @@
-import numpy as np
 import matplotlib.pyplot as plt
 import random
 from collections import deque
 import os
+from grid import Grid, as_grid
+from grid_cache import grid_lru_cache
+from nested_obstacles import generate_obstacle_order, obstacle_counts, nested_best_paths
+from ragged_batch import simulate_ragged
 
 def generate_grid(n, obstacle_density):
     """
@@ -11,7 +14,7 @@ def generate_grid(n, obstacle_density):
     """
     total_cells = n * n
     total_obstacles = int(total_cells * obstacle_density)
-    grid = np.zeros((n, n), dtype=int)
+    grid = Grid(n)
     
     # All positions excluding the start and end positions
     positions = [(i, j) for i in range(n) for j in range(n)]
@@ -29,7 +32,7 @@ def generate_grid(n, obstacle_density):
     obstacle_positions = random.sample(positions, total_obstacles)
     
     for pos in obstacle_positions:
-        grid[pos] = -1  # -1 represents an obstacle
+        grid.block(*pos)
         
     return grid
 
@@ -38,8 +41,10 @@ def find_best_path_with_least_turns(grid):
     Finds the best path from (0,0) to (n-1,n-1) with the least number of turns.
     Returns the number of turns if a path is found, or None if no path exists.
     """
-    n = grid.shape[0]
-    if grid[0][0] == -1 or grid[n-1][n-1] == -1:
+    grid = as_grid(grid)
+    n = grid.n
+    cells = grid.cells
+    if cells[0] or cells[n*n-1]:
         return None  # No path if start or end is blocked
 
     # Directions: right (0), down (1)
@@ -68,7 +73,7 @@ def find_best_path_with_least_turns(grid):
 
         for dx, dy, dir_new in directions:
             nx, ny = x + dx, y + dy
-            if 0 <= nx < n and 0 <= ny < n and grid[nx][ny] != -1:
+            if 0 <= nx < n and 0 <= ny < n and not cells[nx*n + ny]:
                 # Calculate new number of turns
                 if dir_prev == -1:  # Starting cell
                     new_turns = 0
@@ -88,6 +93,9 @@ def find_best_path_with_least_turns(grid):
 
     return min_turns
 
+# Memoized solver used by the simulations; repeated small grids are solved once
+cached_find_best_path_with_least_turns = grid_lru_cache()(find_best_path_with_least_turns)
+
 def simulate(n_values, obstacle_densities, simulations_per_point=5):
     """
     Simulates the best path calculations for different n values and obstacle densities.
@@ -101,7 +109,7 @@ def simulate(n_values, obstacle_densities, simulations_per_point=5):
             successful_simulations = 0
             for _ in range(simulations_per_point):
                 grid = generate_grid(n, density)
-                min_turns = find_best_path_with_least_turns(grid)
+                min_turns = cached_find_best_path_with_least_turns(grid)
                 if min_turns is not None:
                     total_turns += min_turns
                     successful_simulations += 1
@@ -115,6 +123,31 @@ def simulate(n_values, obstacle_densities, simulations_per_point=5):
         results[density] = avg_turns
     return results
 
+def simulate_nested(n_values, obstacle_densities, simulations_per_point=5):
+    """
+    Coupled version of simulate(). Each trial draws one obstacle ordering per n
+    and reads every density off its nested prefixes, recomputing the turn DP
+    once per density. All density curves share the same random grids
+    (common random numbers).
+    """
+    total_turns = {density: [0] * len(n_values) for density in obstacle_densities}
+    successful_simulations = {density: [0] * len(n_values) for density in obstacle_densities}
+    for idx, n in enumerate(n_values):
+        counts = obstacle_counts(n, obstacle_densities)
+        for _ in range(simulations_per_point):
+            order = generate_obstacle_order(n)
+            for density, (_, min_turns) in zip(obstacle_densities, nested_best_paths(n, order, counts)):
+                if min_turns is not None:
+                    total_turns[density][idx] += min_turns
+                    successful_simulations[density][idx] += 1
+    results = {}
+    for density in obstacle_densities:
+        avg_turns = []
+        for total, successes in zip(total_turns[density], successful_simulations[density]):
+            avg_turns.append(total / successes if successes > 0 else 0)  # 0 when no paths were found
+        results[density] = avg_turns
+    return results
+
 def plot_results(n_values, results, obstacle_densities):
     """
     Plots the results of the simulation, handling cases where no paths were found.
@@ -145,12 +178,17 @@ def plot_results(n_values, results, obstacle_densities):
     plt.savefig(os.path.join(save_folder, 'average_turns.png'))
     plt.close()
 
-def avg_turn_main():
+def avg_turn_main(sweep='independent'):
     n_values = range(2, 17)  # Grid sizes from 2x2 to 16x16
     obstacle_densities = [0.0, 0.2, 0.4, 0.5, 0.7]  # Different obstacle densities
     simulations_per_point = 10000  # Number of simulations to average for each point
     random.seed(11505050)
-    results = simulate(n_values, obstacle_densities, simulations_per_point)
+    if sweep == 'nested':
+        results = simulate_nested(n_values, obstacle_densities, simulations_per_point)
+    elif sweep == 'ragged':
+        results = simulate_ragged(n_values, obstacle_densities, simulations_per_point, seed=11505050)['turns']
+    else:
+        results = simulate(n_values, obstacle_densities, simulations_per_point)
     plot_results(n_values, results, obstacle_densities)
 
     # Optionally, print the results
@@ -1,8 +1,11 @@
-import numpy as np
 import random
 import matplotlib.pyplot as plt
 from collections import deque
 import os
+from grid import Grid, as_grid
+from grid_cache import grid_lru_cache
+from nested_obstacles import generate_obstacle_order, obstacle_counts, nested_best_paths
+from ragged_batch import simulate_ragged
 
 
 def generate_grid(n, obstacle_density):
@@ -12,7 +15,7 @@ def generate_grid(n, obstacle_density):
     """
     total_cells = n * n
     total_obstacles = int(total_cells * obstacle_density)
-    grid = np.zeros((n, n), dtype=int)
+    grid = Grid(n)
     
     # All positions excluding the start and end positions
     positions = [(i, j) for i in range(n) for j in range(n)]
@@ -28,7 +31,7 @@ def generate_grid(n, obstacle_density):
     obstacle_positions = random.sample(positions, total_obstacles)
     
     for pos in obstacle_positions:
-        grid[pos] = -1  # -1 represents an obstacle
+        grid.block(*pos)
         
     return grid
 
@@ -38,8 +41,10 @@ def find_best_paths(grid):
     Finds the number of best paths from (0, 0) to (n-1, n-1) with the least number of turns.
     Uses BFS to find all optimal paths.
     """
-    n = grid.shape[0]
-    if grid[0][0] == -1 or grid[n-1][n-1] == -1:
+    grid = as_grid(grid)
+    n = grid.n
+    cells = grid.cells
+    if cells[0] or cells[n*n-1]:
         return 0, float('inf')  # No path if start or end is blocked
 
     # Directions: right (0), down (1)
@@ -72,7 +77,7 @@ def find_best_paths(grid):
 
         for dx, dy, dir_new in directions:
             nx, ny = x + dx, y + dy
-            if 0 <= nx < n and 0 <= ny < n and grid[nx][ny] != -1:
+            if 0 <= nx < n and 0 <= ny < n and not cells[nx*n + ny]:
                 # Calculate new number of turns
                 if dir_prev == -1:  # Starting cell
                     new_turns = 0
@@ -97,8 +102,10 @@ def find_all_best_paths_with_turns(grid, min_turns):
     """
     Finds all paths with the minimum number of turns from (0, 0) to (n-1, n-1).
     """
-    n = grid.shape[0]
-    if grid[0][0] == -1 or grid[n-1][n-1] == -1:
+    grid = as_grid(grid)
+    n = grid.n
+    cells = grid.cells
+    if cells[0] or cells[n*n-1]:
         return 0  # No path if start or end is blocked
 
     # Directions: right (0), down (1)
@@ -122,7 +129,7 @@ def find_all_best_paths_with_turns(grid, min_turns):
 
         for dx, dy, dir_new in directions:
             nx, ny = x + dx, y + dy
-            if 0 <= nx < n and 0 <= ny < n and grid[nx][ny] != -1:
+            if 0 <= nx < n and 0 <= ny < n and not cells[nx*n + ny]:
                 # Calculate new number of turns
                 if dir_prev == -1:  # Starting cell
                     new_turns = 0
@@ -138,6 +145,13 @@ def find_all_best_paths_with_turns(grid, min_turns):
     return best_path_count
 
 
+# Memoized solvers used by the simulations; repeated small grids are solved once.
+# The BFS tally returned by find_best_paths depends on exploration order, so it
+# is not merged with the transposed grid.
+cached_find_best_paths = grid_lru_cache(symmetric=False)(find_best_paths)
+cached_find_all_best_paths_with_turns = grid_lru_cache()(find_all_best_paths_with_turns)
+
+
 def simulate_best_path_counts(n_values, obstacle_densities, simulations_per_point=5):
     """
     Simulates the best path counts for different n values and obstacle densities.
@@ -150,9 +164,9 @@ def simulate_best_path_counts(n_values, obstacle_densities, simulations_per_poin
             total_best_paths = 0
             for _ in range(simulations_per_point):
                 grid = generate_grid(n, density)
-                _, min_turns = find_best_paths(grid)
+                _, min_turns = cached_find_best_paths(grid)
                 if min_turns < float('inf'):
-                    num_best_paths = find_all_best_paths_with_turns(grid, min_turns)
+                    num_best_paths = cached_find_all_best_paths_with_turns(grid, min_turns)
                     total_best_paths += num_best_paths
             average = total_best_paths / simulations_per_point
             best_path_counts.append(average)
@@ -160,6 +174,26 @@ def simulate_best_path_counts(n_values, obstacle_densities, simulations_per_poin
     return results
 
 
+def simulate_best_path_counts_nested(n_values, obstacle_densities, simulations_per_point=5):
+    """
+    Coupled version of simulate_best_path_counts(). Each trial draws one
+    obstacle ordering per n and reads every density off its nested prefixes,
+    recomputing the best-path DP once per density. All density curves
+    share the same random grids (common random numbers).
+    """
+    totals = {density: [0] * len(n_values) for density in obstacle_densities}
+    for idx, n in enumerate(n_values):
+        counts = obstacle_counts(n, obstacle_densities)
+        for _ in range(simulations_per_point):
+            order = generate_obstacle_order(n)
+            for density, (num_best_paths, _) in zip(obstacle_densities, nested_best_paths(n, order, counts)):
+                totals[density][idx] += num_best_paths
+    results = {}
+    for density in obstacle_densities:
+        results[density] = [total / simulations_per_point for total in totals[density]]
+    return results
+
+
 def plot_best_path_counts(n_values, results, obstacle_densities):
     """
     Plots the results of the best path count simulation.
@@ -179,11 +213,16 @@ def plot_best_path_counts(n_values, results, obstacle_densities):
     plt.close()
 
 
-def best_path_count_main():
+def best_path_count_main(sweep='independent'):
     n_values = range(2, 17)  # Grid sizes from 2x2 to 16x16
     obstacle_densities = [0.0, 0.1, 0.2, 0.3, 0.4]  # Different obstacle densities
     simulations_per_point = 10000  # Number of simulations to average for each point
     random.seed(11505050)
     
-    results = simulate_best_path_counts(n_values, obstacle_densities, simulations_per_point)
+    if sweep == 'nested':
+        results = simulate_best_path_counts_nested(n_values, obstacle_densities, simulations_per_point)
+    elif sweep == 'ragged':
+        results = simulate_ragged(n_values, obstacle_densities, simulations_per_point, seed=11505050)['best_paths']
+    else:
+        results = simulate_best_path_counts(n_values, obstacle_densities, simulations_per_point)
     plot_best_path_counts(n_values, results, obstacle_densities)
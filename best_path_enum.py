@@ -0,0 +1,144 @@
+import random
+import sys
+from grid import as_grid
+
+INF = float('inf')
+
+
+class BestPaths:
+    """
+    Every minimum-turn path of one grid, indexed in canonical order (at each
+    step a move right sorts before a move down). A single backward DP pass
+    builds, for every cell and heading, the fewest turns still needed to reach
+    the end and the number of ways to do it. Any path can then be rebuilt from
+    its index in O(path length) without materializing the others.
+    Paths are lists of (x, y) cells from (0, 0) to (n-1, n-1).
+    """
+    __slots__ = ('n', 'count', 'min_turns', '_turns_r', '_turns_d', '_count_r', '_count_d')
+
+    def __init__(self, grid):
+        grid = as_grid(grid)
+        n = grid.n
+        cells = grid.cells
+        end = n * n - 1
+        self.n = n
+
+        # Fewest remaining turns and number of ways to finish, for a walker
+        # standing on a cell after arriving there heading right/down
+        turns_r, turns_d = [INF] * (n * n), [INF] * (n * n)
+        count_r, count_d = [0] * (n * n), [0] * (n * n)
+        for i in range(n - 1, -1, -1):
+            for j in range(n - 1, -1, -1):
+                cell = i * n + j
+                if cells[cell]:
+                    continue
+                if cell == end:
+                    turns_r[cell] = turns_d[cell] = 0
+                    count_r[cell] = count_d[cell] = 1
+                    continue
+                right_t, right_c = (turns_r[cell + 1], count_r[cell + 1]) if j + 1 < n else (INF, 0)
+                down_t, down_c = (turns_d[cell + n], count_d[cell + n]) if i + 1 < n else (INF, 0)
+                turns_r[cell], count_r[cell] = _cheapest(right_t, right_c, down_t + 1, down_c)
+                turns_d[cell], count_d[cell] = _cheapest(down_t, down_c, right_t + 1, right_c)
+        self._turns_r, self._turns_d = turns_r, turns_d
+        self._count_r, self._count_d = count_r, count_d
+
+        if cells[0] or cells[end]:
+            self.count, self.min_turns = 0, None
+        elif end == 0:
+            self.count, self.min_turns = 1, 0  # Start is the end
+        else:
+            # The first move is free in either direction
+            self.min_turns = min(turns_r[1], turns_d[n])
+            self.count = 0
+            if turns_r[1] == self.min_turns:
+                self.count += count_r[1]
+            if turns_d[n] == self.min_turns:
+                self.count += count_d[n]
+            if self.min_turns == INF:
+                self.min_turns = None
+
+    def kth(self, k):
+        """
+        Returns the k-th minimum-turn path (0-based) in canonical order.
+        """
+        if not 0 <= k < self.count:
+            raise IndexError('best path index out of range')
+        n = self.n
+        turns = (self._turns_r, self._turns_d)
+        counts = (self._count_r, self._count_d)
+        cell, heading, budget = 0, None, self.min_turns
+        path = [(0, 0)]
+        while cell != n * n - 1:
+            i, j = divmod(cell, n)
+            # Candidate moves in canonical order: right (0), then down (1)
+            for move, nxt, allowed in ((0, cell + 1, j + 1 < n), (1, cell + n, i + 1 < n)):
+                if not allowed:
+                    continue
+                cost = 0 if heading is None or heading == move else 1
+                if turns[move][nxt] + cost != budget:
+                    continue
+                ways = counts[move][nxt]
+                if k < ways:
+                    cell, heading, budget = nxt, move, budget - cost
+                    break
+                k -= ways
+            path.append(divmod(cell, n))
+        return path
+
+    def __iter__(self):
+        """
+        Lazily yields every minimum-turn path in canonical order.
+        """
+        k = 0
+        while k < self.count:
+            yield self.kth(k)
+            k += 1
+
+    def sample(self, m, rng=random):
+        """
+        Returns m distinct minimum-turn paths drawn uniformly at random.
+        """
+        if m > self.count:
+            raise ValueError('sample larger than the number of best paths')
+        if self.count <= sys.maxsize:
+            indices = rng.sample(range(self.count), m)
+        else:
+            # range() cannot report its length this large; m is tiny in
+            # comparison, so rejecting repeats is cheap
+            indices, seen = [], set()
+            while len(indices) < m:
+                k = rng.randrange(self.count)
+                if k not in seen:
+                    seen.add(k)
+                    indices.append(k)
+        return [self.kth(k) for k in indices]
+
+
+def _cheapest(t_straight, c_straight, t_turn, c_turn):
+    if t_straight < t_turn:
+        return t_straight, c_straight
+    if t_turn < t_straight:
+        return t_turn, c_turn
+    return t_straight, c_straight + c_turn
+
+
+def iter_best_paths(grid):
+    """
+    Lazily yields the minimum-turn paths of a grid in canonical order.
+    """
+    return iter(BestPaths(grid))
+
+
+def kth_best_path(grid, k):
+    """
+    Returns the k-th minimum-turn path (0-based) of a grid in canonical order.
+    """
+    return BestPaths(grid).kth(k)
+
+
+def sample_best_paths(grid, m, rng=random):
+    """
+    Returns m distinct minimum-turn paths of a grid drawn uniformly at random.
+    """
+    return BestPaths(grid).sample(m, rng)
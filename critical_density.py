@@ -0,0 +1,99 @@
+import matplotlib.pyplot as plt
+import multiprocessing
+import random
+import statistics
+import os
+from nested_obstacles import generate_obstacle_order
+
+
+def critical_obstacle_count(n, order):
+    """
+    Adds the obstacles of `order` one at a time and returns the exact number
+    placed when (n-1, n-1) stops being reachable from (0, 0) with right/down
+    moves. Reachability is maintained incrementally: a blocked cell can only
+    cut off cells below and to the right of it, and each cell loses
+    reachability at most once, so a whole trial costs O(n^2).
+    """
+    end = n * n - 1
+    reachable = bytearray(b'\x01') * (n * n)  # The empty grid reaches every cell
+    for count, (i, j) in enumerate(order, start=1):
+        cell = i * n + j
+        if reachable[cell]:
+            reachable[cell] = 0
+            stack = [cell]
+            while stack:
+                lost = stack.pop()
+                row, col = divmod(lost, n)
+                # Successors that may have depended on the lost cell
+                for succ, inside in ((lost + 1, col + 1 < n), (lost + n, row + 1 < n)):
+                    if not inside or not reachable[succ]:
+                        continue
+                    succ_row, succ_col = divmod(succ, n)
+                    from_up = succ_row > 0 and reachable[succ - n]
+                    from_left = succ_col > 0 and reachable[succ - 1]
+                    if not (from_up or from_left):
+                        reachable[succ] = 0
+                        stack.append(succ)
+            if not reachable[end]:
+                return count
+    return None  # Only when there are no interior cells to block
+
+
+def _critical_counts_chunk(args):
+    n, trials, seed = args
+    random.seed(seed)
+    return [critical_obstacle_count(n, generate_obstacle_order(n)) for _ in range(trials)]
+
+
+def simulate_critical_densities(n_values, trials_per_n=1000, workers=None, seed=11505050, chunk_size=250):
+    """
+    Returns {n: [critical density per trial]}. The critical density of a trial
+    is k / n^2 for its critical obstacle count k: the smallest density at which
+    generate_grid's int(n*n*density) obstacles leave zero paths. Trials are
+    split into seeded chunks and run across `workers` processes.
+    """
+    seeder = random.Random(seed)
+    jobs = []
+    for n in n_values:
+        for start in range(0, trials_per_n, chunk_size):
+            jobs.append((n, min(chunk_size, trials_per_n - start), seeder.getrandbits(32)))
+    with multiprocessing.Pool(workers) as pool:
+        chunks = pool.map(_critical_counts_chunk, jobs)
+
+    results = {n: [] for n in n_values}
+    for (n, _, _), counts in zip(jobs, chunks):
+        results[n].extend(count / (n * n) for count in counts if count is not None)
+    return results
+
+
+def plot_critical_densities(n_values, results):
+    """
+    Plots the distribution of critical densities for every grid size.
+    """
+    save_folder = 'result_images'
+    if not os.path.exists(save_folder):
+        os.makedirs(save_folder)
+    plt.figure(figsize=(12, 8))
+    n_values = list(n_values)
+    plt.boxplot([results[n] for n in n_values], positions=n_values, showfliers=False)
+    plt.plot(n_values, [statistics.mean(results[n]) for n in n_values], marker='o', color='red', label='Mean')
+    plt.title('Critical Obstacle Density (Zero Paths) vs Grid Size')
+    plt.xlabel('Grid Size (n)')
+    plt.ylabel('Critical Obstacle Density')
+    plt.legend()
+    plt.grid(True)
+    plt.savefig(os.path.join(save_folder, 'critical_density.png'))
+    plt.close()
+
+
+def critical_density_main():
+    n_values = range(2, 17)  # Grid sizes from 2x2 to 16x16
+    trials_per_n = 10000  # One exact threshold sample per trial
+    results = simulate_critical_densities(n_values, trials_per_n)
+    plot_critical_densities(n_values, results)
+
+    print("Grid Size (n) | Mean Critical Density | Std. Dev. | Median")
+    print("----------------------------------------------------------")
+    for n in n_values:
+        densities = results[n]
+        print(f"{n:<13} | {statistics.mean(densities):<21.4f} | {statistics.stdev(densities):<9.4f} | {statistics.median(densities):.4f}")
@@ -0,0 +1,75 @@
+import numpy as np
+
+
+class Grid:
+    """
+    Compact n x n grid backed by one contiguous bytearray in row-major order,
+    one byte per cell: 0 is free, 1 is an obstacle. Cell (i, j) lives at flat
+    index i * n + j, so solvers can test `cells[index]` directly instead of
+    building a row view per access.
+    """
+    __slots__ = ('n', 'cells')
+
+    def __init__(self, n, cells=None):
+        if cells is None:
+            cells = bytearray(n * n)
+        elif len(cells) != n * n:
+            raise ValueError(f"expected {n * n} cells, got {len(cells)}")
+        self.n = n
+        self.cells = cells
+
+    @classmethod
+    def from_array(cls, grid):
+        """
+        Builds a Grid from an n x n array or nested list where -1 marks an
+        obstacle.
+        """
+        blocked = np.asarray(grid) == -1
+        return cls(blocked.shape[0], bytearray(blocked.astype(np.uint8).tobytes()))
+
+    @classmethod
+    def from_packed(cls, n, packed):
+        """
+        Builds a Grid from the bit-packed form returned by packed().
+        """
+        bits = np.unpackbits(np.frombuffer(packed, dtype=np.uint8), count=n * n)
+        return cls(n, bytearray(bits.tobytes()))
+
+    def is_free(self, index):
+        return not self.cells[index]
+
+    def block(self, i, j):
+        self.cells[i * self.n + j] = 1
+
+    def view(self):
+        """
+        Zero-copy (n, n) uint8 view of the cells for the vectorized engines.
+        Writes through the view change the grid.
+        """
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.n, self.n)
+
+    def packed(self):
+        """
+        Bit-packed copy of the cells (one bit per cell), used as a compact key
+        and for sending grids between processes.
+        """
+        return np.packbits(self.view()).tobytes()
+
+    def to_array(self):
+        """
+        Legacy representation: an n x n int array with -1 marking obstacles.
+        """
+        return -self.view().astype(int)
+
+    def __repr__(self):
+        return f"Grid(n={self.n}, obstacles={self.view().sum()})"
+
+
+def as_grid(grid):
+    """
+    Returns `grid` as a Grid, converting arrays and nested lists that use -1
+    as the obstacle marker.
+    """
+    if isinstance(grid, Grid):
+        return grid
+    return Grid.from_array(grid)
@@ -0,0 +1,60 @@
+import numpy as np
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from grid import as_grid
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+def canonical_grid_key(grid, symmetric=True):
+    """
+    Packs the obstacle cells of a grid into bytes. With symmetric=True the
+    smaller of the grid and its transpose is used, since swapping right and
+    down moves maps every path of one onto a path of the other with the same
+    number of turns.
+    """
+    grid = as_grid(grid)
+    key = grid.packed()
+    if symmetric:
+        key = min(key, np.packbits(grid.view().T).tobytes())
+    return grid.n, key
+
+
+def grid_lru_cache(maxsize=65536, symmetric=True):
+    """
+    Decorator memoizing a solver whose first argument is a grid. Results are
+    keyed on the canonical packed form of the grid plus the remaining
+    arguments and evicted least-recently-used once `maxsize` entries are held.
+    Like functools.lru_cache, the wrapper exposes cache_info() and
+    cache_clear(). Pass symmetric=False for solvers whose result depends on
+    the orientation of the grid.
+    """
+    def decorator(func):
+        cache = OrderedDict()
+        stats = [0, 0]  # hits, misses
+
+        @wraps(func)
+        def wrapper(grid, *args):
+            key = (canonical_grid_key(grid, symmetric), args)
+            if key in cache:
+                cache.move_to_end(key)
+                stats[0] += 1
+                return cache[key]
+            stats[1] += 1
+            result = func(grid, *args)
+            cache[key] = result
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+            return result
+
+        def cache_info():
+            return CacheInfo(stats[0], stats[1], maxsize, len(cache))
+
+        def cache_clear():
+            cache.clear()
+            stats[0] = stats[1] = 0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
@@ -3,6 +3,7 @@ from best_path_trend import best_path_trend_main
 from avg_turn import avg_turn_main
 from algo_compare import algo_compare_main
 from best_path_count import best_path_count_main
+from critical_density import critical_density_main
 
 def main():
     # Run the possible_path module
@@ -25,6 +26,11 @@ def main():
     avg_turn_main()
     print("Finished avg_turn module.\n")
 
+    # Run the critical_density module
+    print("Running critical_density module...")
+    critical_density_main()
+    print("Finished critical_density module.\n")
+
     # Run the algo_compare module
     print("Running algo_compare module...")
     algo_compare_main()
@@ -0,0 +1,185 @@
+import random
+from grid import Grid, as_grid
+
+INF = float('inf')
+
+
+def generate_obstacle_order(n):
+    """
+    Draws one random ordering of the n*n - 2 interior cells (every cell except
+    the start and end positions). The grid at a given density is the first
+    int(n * n * density) cells of this ordering, so all densities of a trial
+    share one nested family of obstacle sets.
+    """
+    positions = [(i, j) for i in range(n) for j in range(n)]
+    positions.remove((0, 0))
+    positions.remove((n-1, n-1))
+    return random.sample(positions, len(positions))
+
+
+def obstacle_counts(n, obstacle_densities):
+    """
+    Returns the number of obstacles placed at each density, capped the same
+    way generate_grid caps it.
+    """
+    max_obstacles = n * n - 2
+    return [min(int(n * n * density), max_obstacles) for density in obstacle_densities]
+
+
+def _nested_sweep(n, order, counts, solve):
+    """
+    Appends obstacles from `order` in increasing count order and solves the
+    grid with solve(n, cells) after each batch, one full DP pass per density.
+    Returns one result per entry of `counts`, in the original order.
+    """
+    grid = Grid(n)
+    results = [None] * len(counts)
+    placed = 0
+    for idx in sorted(range(len(counts)), key=lambda k: counts[k]):
+        for i, j in order[placed:counts[idx]]:
+            grid.block(i, j)
+        placed = counts[idx]
+        results[idx] = solve(n, grid.cells)
+    return results
+
+
+def _path_count(n, cells):
+    # One rolling row: row[j] holds the count of the cell above until it is
+    # overwritten, so memory stays O(n) however large the counts grow
+    row = [0] * n
+    row[0] = 1  # The start cell, as if one path arrived from above
+    for i in range(n):
+        base = i * n
+        for j in range(n):
+            if cells[base + j]:
+                row[j] = 0
+            elif j > 0:
+                row[j] += row[j - 1]
+    return row[n - 1]
+
+
+def _combine(t_straight, c_straight, t_turn, c_turn):
+    """
+    Merges the straight and turning predecessors of a state, keeping the
+    fewest turns and summing the path counts of ties.
+    """
+    t_turn += 1
+    if t_straight < t_turn:
+        return t_straight, c_straight
+    if t_turn < t_straight:
+        return t_turn, c_turn
+    return t_straight, c_straight + c_turn
+
+
+def _update_turns(n, cells, state):
+    # Minimum turns and number of minimum-turn paths arriving heading right/down
+    turns_r, turns_d, count_r, count_d = state
+    for i in range(n):
+        base = i * n
+        for j in range(n):
+            cell = base + j
+            if cells[cell]:
+                turns_r[cell] = turns_d[cell] = INF
+                count_r[cell] = count_d[cell] = 0
+            elif cell == 0:
+                # The first move is free in either direction
+                turns_r[cell] = turns_d[cell] = 0
+                count_r[cell] = count_d[cell] = 1
+            else:
+                if j > 0:
+                    turns_r[cell], count_r[cell] = _combine(
+                        turns_r[cell - 1], count_r[cell - 1], turns_d[cell - 1], count_d[cell - 1])
+                else:
+                    turns_r[cell], count_r[cell] = INF, 0
+                if i > 0:
+                    turns_d[cell], count_d[cell] = _combine(
+                        turns_d[cell - n], count_d[cell - n], turns_r[cell - n], count_r[cell - n])
+                else:
+                    turns_d[cell], count_d[cell] = INF, 0
+
+
+def _read_best_paths(n, state):
+    turns_r, turns_d, count_r, count_d = state
+    end = n * n - 1
+    if end == 0:
+        return 1, 0  # Start is the end
+    min_turns = min(turns_r[end], turns_d[end])
+    if min_turns == INF:
+        return 0, None
+    best_path_count = 0
+    if turns_r[end] == min_turns:
+        best_path_count += count_r[end]
+    if turns_d[end] == min_turns:
+        best_path_count += count_d[end]
+    return best_path_count, min_turns
+
+
+def _new_turn_state(n):
+    return [INF] * (n * n), [INF] * (n * n), [0] * (n * n), [0] * (n * n)
+
+
+def _best_paths(n, cells):
+    state = _new_turn_state(n)
+    _update_turns(n, cells, state)
+    return _read_best_paths(n, state)
+
+
+def nested_path_counts(n, order, counts):
+    """
+    Returns the number of possible paths for the grids made of the first
+    counts[k] obstacles of `order`, for every k.
+    """
+    return _nested_sweep(n, order, counts, _path_count)
+
+
+def nested_best_paths(n, order, counts):
+    """
+    Returns (best_path_count, min_turns) for the grids made of the first
+    counts[k] obstacles of `order`, for every k. min_turns is None when the
+    end cannot be reached.
+    """
+    return _nested_sweep(n, order, counts, _best_paths)
+
+
+def solve_path_count(grid):
+    """
+    Returns the number of possible paths for a single grid.
+    """
+    grid = as_grid(grid)
+    return _path_count(grid.n, grid.cells)
+
+
+def solve_best_path(grid):
+    """
+    Solves a single grid.
+    Returns (best_path_count, min_turns, path) where path is the list of
+    (x, y) cells of one minimum-turn path. Returns (0, None, []) when the end
+    cannot be reached.
+    """
+    grid = as_grid(grid)
+    n = grid.n
+    if grid.cells[0] or grid.cells[n * n - 1]:
+        return 0, None, []
+    state = _new_turn_state(n)
+    _update_turns(n, grid.cells, state)
+    best_path_count, min_turns = _read_best_paths(n, state)
+    if min_turns is None:
+        return 0, None, []
+
+    # Walk the turn tables back from the end, always stepping to a predecessor
+    # state that is still on a minimum-turn path
+    turns_r, turns_d, _, _ = state
+    cell = n * n - 1
+    heading_right = turns_r[cell] == min_turns
+    turns = min_turns
+    path = [(n - 1, n - 1)]
+    while cell != 0:
+        prev = cell - 1 if heading_right else cell - n
+        straight = turns_r if heading_right else turns_d
+        if straight[prev] != turns:
+            heading_right = not heading_right
+            turns -= 1
+        cell = prev
+        path.append(divmod(cell, n))
+    path.reverse()
+    return best_path_count, min_turns, path
@@ -1,7 +1,10 @@
-import numpy as np
 import matplotlib.pyplot as plt
 import random
 import os
+from grid import Grid, as_grid
+from grid_cache import grid_lru_cache
+from nested_obstacles import generate_obstacle_order, obstacle_counts, nested_path_counts
+from ragged_batch import simulate_ragged
 
 def generate_grid(n, obstacle_density):
     """
@@ -10,7 +13,7 @@ def generate_grid(n, obstacle_density):
     """
     total_cells = n * n
     total_obstacles = int(total_cells * obstacle_density)
-    grid = np.zeros((n, n), dtype=int)
+    grid = Grid(n)
     
     # All positions excluding the start and end positions
     positions = [(i, j) for i in range(n) for j in range(n)]
@@ -28,7 +31,7 @@ def generate_grid(n, obstacle_density):
     obstacle_positions = random.sample(positions, total_obstacles)
     
     for pos in obstacle_positions:
-        grid[pos] = -1  # -1 represents an obstacle
+        grid.block(*pos)
         
     return grid
 
@@ -37,36 +40,42 @@ def calculate_number_of_paths(grid):
     Calculates the number of possible paths from the top-left corner to the
     bottom-right corner in a grid, considering obstacles.
     """
-    n = grid.shape[0]
-    dp = np.zeros((n, n), dtype=int)
+    grid = as_grid(grid)
+    n = grid.n
+    cells = grid.cells
+    # Flat dp table of Python ints, so large counts do not overflow
+    dp = [0] * (n * n)
     
-    # If the starting cell is not an obstacle, set dp[0][0] to 1
-    if grid[0][0] == -1:
+    # If the starting cell is not an obstacle, set dp[0] to 1
+    if cells[0]:
         return 0
     else:
-        dp[0][0] = 1
+        dp[0] = 1
 
     # Initialize the first row and first column
     for i in range(1, n):
-        if grid[i][0] == -1:
-            dp[i][0] = 0
+        if cells[i*n]:
+            dp[i*n] = 0
         else:
-            dp[i][0] = dp[i-1][0]
+            dp[i*n] = dp[(i-1)*n]
     for j in range(1, n):
-        if grid[0][j] == -1:
-            dp[0][j] = 0
+        if cells[j]:
+            dp[j] = 0
         else:
-            dp[0][j] = dp[0][j-1]
+            dp[j] = dp[j-1]
 
     # Fill in the rest of the dp table
     for i in range(1, n):
-        for j in range(1, n):
-            if grid[i][j] == -1:
-                dp[i][j] = 0
+        for k in range(i*n + 1, (i+1)*n):
+            if cells[k]:
+                dp[k] = 0
             else:
-                dp[i][j] = dp[i-1][j] + dp[i][j-1]
+                dp[k] = dp[k-n] + dp[k-1]
                 
-    return dp[n-1][n-1]
+    return dp[n*n-1]
+
+# Memoized solver used by the simulations; repeated small grids are solved once
+cached_calculate_number_of_paths = grid_lru_cache()(calculate_number_of_paths)
 
 def simulate(n_values, obstacle_densities, simulations_per_point=5):
     """
@@ -80,13 +89,32 @@ def simulate(n_values, obstacle_densities, simulations_per_point=5):
             total_paths = 0
             for _ in range(simulations_per_point):
                 grid = generate_grid(n, density)
-                num_paths = calculate_number_of_paths(grid)
+                num_paths = cached_calculate_number_of_paths(grid)
                 total_paths += num_paths
             average = total_paths / simulations_per_point
             avg_paths.append(average)
         results[density] = avg_paths
     return results
 
+def simulate_nested(n_values, obstacle_densities, simulations_per_point=5):
+    """
+    Coupled version of simulate(). Each trial draws one obstacle ordering per n
+    and reads every density off its nested prefixes, recomputing the
+    path-count DP once per density. All density curves share the same random
+    grids (common random numbers).
+    """
+    totals = {density: [0] * len(n_values) for density in obstacle_densities}
+    for idx, n in enumerate(n_values):
+        counts = obstacle_counts(n, obstacle_densities)
+        for _ in range(simulations_per_point):
+            order = generate_obstacle_order(n)
+            for density, num_paths in zip(obstacle_densities, nested_path_counts(n, order, counts)):
+                totals[density][idx] += num_paths
+    results = {}
+    for density in obstacle_densities:
+        results[density] = [total / simulations_per_point for total in totals[density]]
+    return results
+
 def plot_results(n_values, results, obstacle_densities):
     """
     Plots the results of the simulation.
@@ -132,10 +160,15 @@ def plot_results(n_values, results, obstacle_densities):
     plt.savefig(os.path.join(save_folder, 'possible_paths.png'))
     plt.close()
 
-def possible_path_main():
+def possible_path_main(sweep='independent'):
     n_values = range(2, 17)  # Grid sizes from 2x2 to 16x16
     obstacle_densities = [0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6]  # Different obstacle densities
     simulations_per_point = 10000  # Number of simulations to average for each point
     random.seed(11505050)
-    results = simulate(n_values, obstacle_densities, simulations_per_point)
+    if sweep == 'nested':
+        results = simulate_nested(n_values, obstacle_densities, simulations_per_point)
+    elif sweep == 'ragged':
+        results = simulate_ragged(n_values, obstacle_densities, simulations_per_point, seed=11505050)['paths']
+    else:
+        results = simulate(n_values, obstacle_densities, simulations_per_point)
     plot_results(n_values, results, obstacle_densities)
\ No newline at end of file
@@ -0,0 +1,178 @@
+import numpy as np
+
+INF = 1 << 20  # Turn count of unreachable states; far above any real count, and +1 stays in int32
+# Path counts are int64; C(2n-2, n-1) paths of an empty 35 x 35 grid overflow it
+MAX_RAGGED_GRID_SIZE = 34
+
+
+def _check_grid_size(n_max):
+    if n_max > MAX_RAGGED_GRID_SIZE:
+        raise ValueError(f'grid size {n_max} exceeds MAX_RAGGED_GRID_SIZE ({MAX_RAGGED_GRID_SIZE}); '
+                         'path counts would overflow int64')
+
+
+def pack_ragged_grids(grids):
+    """
+    Packs Grid objects of different sizes into a padded (B, n_max, n_max)
+    bool array of obstacles plus a (B,) array of grid sizes. Raises
+    ValueError for grids larger than MAX_RAGGED_GRID_SIZE.
+    """
+    n_max = max(grid.n for grid in grids)
+    _check_grid_size(n_max)
+    blocked = np.ones((len(grids), n_max, n_max), dtype=bool)
+    for b, grid in enumerate(grids):
+        blocked[b, :grid.n, :grid.n] = grid.view() != 0
+    return blocked, np.array([grid.n for grid in grids])
+
+
+def random_ragged_batch(n_values, obstacle_densities, trials, rng):
+    """
+    Draws `trials` random grids for every (n, density) pair, placing
+    int(n*n*density) obstacles away from the start and end like generate_grid.
+    Returns (blocked, sizes, groups) where groups lists (n, density, rows) with
+    `rows` the slice of the batch holding that pair's grids.
+    """
+    n_max = max(n_values)
+    total = len(n_values) * len(obstacle_densities) * trials
+    blocked = np.ones((total, n_max, n_max), dtype=bool)
+    sizes = np.empty(total, dtype=np.int64)
+    groups = []
+    offset = 0
+    for n in n_values:
+        rows = len(obstacle_densities) * trials
+        # A random rank per cell; the start and end always rank last
+        keys = rng.random((rows, n * n))
+        keys[:, [0, n * n - 1]] = np.inf
+        ranks = np.empty((rows, n * n), dtype=np.int64)
+        np.put_along_axis(ranks, np.argsort(keys, axis=1), np.arange(n * n), axis=1)
+        counts = np.repeat([min(int(n * n * density), n * n - 2) for density in obstacle_densities], trials)
+        blocked[offset:offset + rows, :n, :n] = (ranks < counts[:, None]).reshape(rows, n, n)
+        sizes[offset:offset + rows] = n
+        for density in obstacle_densities:
+            groups.append((n, density, slice(offset, offset + trials)))
+            offset += trials
+    return blocked, sizes, groups
+
+
+def _cheapest(t_straight, c_straight, t_turn, c_turn):
+    t = np.minimum(t_straight, t_turn)
+    c = np.where(t_straight == t, c_straight, 0) + np.where(t_turn == t, c_turn, 0)
+    return t, c
+
+
+def solve_ragged(blocked, sizes):
+    """
+    Solves a padded batch of grids in one vectorized sweep over the rows of
+    the largest grid. Cells outside a grid's own n x n block are masked as
+    obstacles, and each grid's answer is read at its own (n-1, n-1) when the
+    sweep passes row n-1.
+    Returns (path_counts, min_turns, best_path_counts) arrays of shape (B,);
+    min_turns is -1 where no path exists. Counts are exact int64 values, so
+    grids larger than MAX_RAGGED_GRID_SIZE raise ValueError.
+    """
+    batch, n_max, _ = blocked.shape
+    sizes = np.asarray(sizes)
+    _check_grid_size(int(sizes.max(initial=0)))
+    inside = np.arange(n_max) < sizes[:, None]  # (B, n_max) size mask
+    free = ~blocked & inside[:, :, None] & inside[:, None, :]
+
+    # Largest grids first with the batch axis last: the grids still covering
+    # row or column k are then a contiguous prefix, and every vector op below
+    # runs over contiguous memory
+    order = np.argsort(-sizes, kind='stable')
+    sizes_sorted = sizes[order]
+    free = np.ascontiguousarray(free[order].transpose(1, 2, 0))  # (n_max, n_max, B)
+    extent = [int((sizes_sorted > k).sum()) for k in range(n_max + 1)]
+
+    path_counts = np.zeros(batch, dtype=np.int64)
+    min_turns = np.full(batch, -1, dtype=np.int64)
+    best_path_counts = np.zeros(batch, dtype=np.int64)
+
+    # Previous row: possible paths, and minimum turns / number of minimum-turn
+    # paths arriving heading right (r) or down (d)
+    paths_up = np.zeros((n_max, batch), dtype=np.int64)
+    turns_r_up = np.full((n_max, batch), INF, dtype=np.int32)
+    turns_d_up = np.full((n_max, batch), INF, dtype=np.int32)
+    count_r_up = np.zeros((n_max, batch), dtype=np.int64)
+    count_d_up = np.zeros((n_max, batch), dtype=np.int64)
+
+    for i in range(n_max):
+        m = extent[i]  # Grids with a row i
+        row_free = free[i, :, :m]
+        # Moves down only depend on the previous row, so the whole row is done at once
+        turns_d, count_d = _cheapest(turns_d_up[:, :m], count_d_up[:, :m], turns_r_up[:, :m] + 1, count_r_up[:, :m])
+        turns_d = np.where(row_free, turns_d, INF)
+        count_d = np.where(row_free, count_d, 0)
+        paths = np.where(row_free, paths_up[:, :m], 0)
+        turns_r = np.full((n_max, m), INF, dtype=np.int32)
+        count_r = np.zeros((n_max, m), dtype=np.int64)
+        if i == 0:
+            # The first move is free in either direction
+            start_free = row_free[0]
+            turns_r[0] = turns_d[0] = np.where(start_free, 0, INF)
+            count_r[0] = count_d[0] = start_free
+            paths[0] = start_free
+
+        # Moves right scan along the row, over the grids wide enough for column j
+        for j in range(1, n_max):
+            w = min(extent[j], m)
+            cell_free = row_free[j, :w]
+            t, c = _cheapest(turns_r[j - 1, :w], count_r[j - 1, :w], turns_d[j - 1, :w] + 1, count_d[j - 1, :w])
+            turns_r[j, :w] = np.where(cell_free, t, INF)
+            count_r[j, :w] = np.where(cell_free, c, 0)
+            paths[j, :w] += np.where(cell_free, paths[j - 1, :w], 0)
+
+        # Grids whose end lies on this row
+        done = slice(extent[i + 1], m)
+        if done.start < done.stop:
+            ids = order[done]
+            path_counts[ids] = paths[i, done]
+            t_r, t_d = turns_r[i, done], turns_d[i, done]
+            t = np.minimum(t_r, t_d)
+            best = np.where(t_r == t, count_r[i, done], 0) + np.where(t_d == t, count_d[i, done], 0)
+            reachable = t < INF
+            min_turns[ids] = np.where(reachable, t, -1)
+            best_path_counts[ids] = np.where(reachable, best, 0)
+
+        paths_up, turns_r_up, turns_d_up, count_r_up, count_d_up = paths, turns_r, turns_d, count_r, count_d
+
+    # A 1 x 1 grid is counted once, not once per starting direction
+    best_path_counts[sizes == 1] = np.minimum(best_path_counts[sizes == 1], 1)
+    return path_counts, min_turns, best_path_counts
+
+
+def simulate_ragged(n_values, obstacle_densities, simulations_per_point=5, chunk_size=1000, seed=None):
+    """
+    Runs the possible-path, average-turn and best-path-count simulations for
+    every grid size and density at once, solving each chunk of trials as one
+    padded batch. Returns {'paths': ..., 'turns': ..., 'best_paths': ...},
+    each a {density: [value per n]} dictionary in the format the existing
+    plot functions expect. Grid sizes are limited to MAX_RAGGED_GRID_SIZE.
+    """
+    n_values = list(n_values)
+    _check_grid_size(max(n_values))
+    rng = np.random.default_rng(seed)
+    path_totals, turn_totals, successes, best_totals = {}, {}, {}, {}
+    remaining = simulations_per_point
+    while remaining > 0:
+        trials = min(chunk_size, remaining)
+        remaining -= trials
+        blocked, sizes, groups = random_ragged_batch(n_values, obstacle_densities, trials, rng)
+        path_counts, min_turns, best_path_counts = solve_ragged(blocked, sizes)
+        for n, density, rows in groups:
+            key = (n, density)
+            found = min_turns[rows] >= 0
+            # Totals in Python ints: a sum of int64 counts could itself overflow
+            path_totals[key] = path_totals.get(key, 0) + sum(path_counts[rows].tolist())
+            turn_totals[key] = turn_totals.get(key, 0) + int(min_turns[rows][found].sum())
+            successes[key] = successes.get(key, 0) + int(found.sum())
+            best_totals[key] = best_totals.get(key, 0) + sum(best_path_counts[rows].tolist())
+
+    results = {'paths': {}, 'turns': {}, 'best_paths': {}}
+    for density in obstacle_densities:
+        keys = [(n, density) for n in n_values]
+        results['paths'][density] = [path_totals[key] / simulations_per_point for key in keys]
+        # Average over the trials with a path, 0 when no paths were found
+        results['turns'][density] = [turn_totals[key] / successes[key] if successes[key] > 0 else 0 for key in keys]
+        results['best_paths'][density] = [best_totals[key] / simulations_per_point for key in keys]
+    return results
@@ -0,0 +1,248 @@
+import argparse
+import asyncio
+import json
+import os
+from urllib.parse import urlsplit
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+from grid import Grid
+from grid_cache import canonical_grid_key
+from nested_obstacles import solve_best_path, solve_path_count
+
+MAX_GRID_SIZE = 4096  # Largest n accepted; one solve at this size peaks at about 0.6 GiB in its worker
+MAX_BODY_BYTES = 5 * MAX_GRID_SIZE ** 2  # Fits the dense "grid" form ("-1, " per cell) at MAX_GRID_SIZE
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)  # Bounds the memory of concurrent large solves
+LOCAL_HOSTS = ('localhost', '127.0.0.1', '::1')
+VISUALIZE_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'visualize.html')
+
+
+def parse_grid(payload):
+    """
+    Builds a Grid from a request payload of the form {"n": 5, "obstacles": [[x, y], ...]} or {"grid": [[0, -1, ...], ...]}.
+    Raises ValueError for malformed payloads.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError('payload must be a JSON object')
+    if 'grid' in payload:
+        grid = np.asarray(payload['grid'])
+        if grid.ndim != 2 or grid.shape[0] != grid.shape[1] or grid.shape[0] < 1:
+            raise ValueError('grid must be a non-empty square array')
+        if grid.shape[0] > MAX_GRID_SIZE:
+            raise ValueError(f'grid side must be at most {MAX_GRID_SIZE}')
+        return Grid.from_array(grid)
+    n = payload.get('n')
+    if not isinstance(n, int) or isinstance(n, bool) or n < 1:
+        raise ValueError('n must be a positive integer')
+    if n > MAX_GRID_SIZE:
+        raise ValueError(f'n must be at most {MAX_GRID_SIZE}')
+    obstacles = payload.get('obstacles', [])
+    # Exact int checks: NumPy would silently truncate floats and accept booleans
+    if not isinstance(obstacles, list) or not all(
+            isinstance(pos, list) and len(pos) == 2 and all(type(v) is int for v in pos) for pos in obstacles):
+        raise ValueError('obstacles must be a list of [x, y] integer pairs')
+    grid = Grid(n)
+    obstacles = np.asarray(obstacles, dtype=np.int64).reshape(-1, 2)
+    if obstacles.size and (obstacles.min() < 0 or obstacles.max() >= n):
+        raise ValueError('obstacle coordinates must lie inside the grid')
+    grid.view()[obstacles[:, 0], obstacles[:, 1]] = 1
+    return grid
+
+
+def parse_solve_request(body):
+    """
+    Worker-side parse of a /solve body into its cache key (n, packed). Decoding
+    and validating a large body takes seconds, so it stays off the event loop.
+    Raises ValueError for malformed bodies.
+    """
+    try:
+        payload = json.loads(body)
+    except ValueError as error:
+        raise ValueError(f'malformed JSON: {error}') from None
+    # Path coordinates depend on orientation, so transposes are not merged
+    return canonical_grid_key(parse_grid(payload), symmetric=False)
+
+
+def solve_packed_grid(n, packed):
+    """
+    Worker-side solve of a grid given as packed obstacle bits. Big integers are
+    returned as strings so JavaScript clients do not round them.
+    """
+    grid = Grid.from_packed(n, packed)
+    best_path_count, min_turns, path = solve_best_path(grid)
+    return {
+        'n': n,
+        'total_paths': str(solve_path_count(grid)),
+        'min_turns': min_turns,
+        'best_path_count': str(best_path_count),
+        'path': [[x, y] for x, y in path],
+    }
+
+
+class SolveService:
+    """
+    Parses and solves requests in a process pool so the event loop stays
+    responsive.
+    Identical requests that arrive while a solve is in flight share its result,
+    and the most recent results are kept in an LRU cache.
+    """
+
+    def __init__(self, executor, cache_size=256):
+        self.executor = executor
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.in_flight = {}
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0}
+
+    async def parse(self, body):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, parse_solve_request, body)
+
+    async def solve(self, key):
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.stats['hits'] += 1
+            return self.cache[key]
+        task = self.in_flight.get(key)
+        if task is None:
+            self.stats['misses'] += 1
+            task = asyncio.ensure_future(self._run(key))
+            self.in_flight[key] = task
+        else:
+            self.stats['coalesced'] += 1
+        # A client disconnecting must not cancel the solve for the others
+        return await asyncio.shield(task)
+
+    async def _run(self, key):
+        n, packed = key
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self.executor, solve_packed_grid, n, packed)
+        finally:
+            del self.in_flight[key]
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result
+
+
+async def read_request(reader):
+    """
+    Reads one HTTP/1.1 request. Returns (method, path, headers, body).
+    """
+    request_line = (await reader.readline()).decode('latin-1').strip()
+    if not request_line:
+        raise ConnectionError('empty request')
+    method, target, _ = request_line.split(' ', 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length', 0))
+    if length > MAX_BODY_BYTES:
+        raise ValueError('request body too large')
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), target.split('?', 1)[0], headers, body
+
+
+def same_origin(origin, host):
+    """
+    True when a browser request comes from a page served by this service
+    itself on a loopback address. Pages from other sites, including sandboxed
+    and data: pages whose origin is "null", are refused, and no CORS headers
+    are ever sent. The loopback check stops DNS-rebinding pages that reach
+    the service under their own host name. Requests without an Origin header
+    (curl, scripts) are not browser requests and are not checked here.
+    """
+    try:
+        parts = urlsplit(origin)
+    except ValueError:
+        return False
+    return parts.scheme == 'http' and parts.hostname in LOCAL_HOSTS and parts.netloc == host
+
+
+def write_response(writer, status, body=b'', content_type='application/json'):
+    headers = [
+        f'HTTP/1.1 {status.value} {status.phrase}',
+        f'Content-Type: {content_type}',
+        f'Content-Length: {len(body)}',
+        'Connection: close',
+    ]
+    writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body)
+
+
+def json_body(data):
+    return json.dumps(data).encode('utf-8')
+
+
+async def handle_connection(service, reader, writer):
+    try:
+        try:
+            method, path, headers, body = await read_request(reader)
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            write_response(writer, HTTPStatus.BAD_REQUEST, json_body({'error': 'malformed request'}))
+            return
+
+        origin = headers.get('origin')
+        if origin is not None and not same_origin(origin, headers.get('host')):
+            # Browsers send Origin on POST and cross-site requests; refuse foreign pages outright
+            write_response(writer, HTTPStatus.FORBIDDEN, json_body({'error': 'origin not allowed'}))
+        elif method == 'GET' and path in ('/', '/visualize.html'):
+            with open(VISUALIZE_PAGE, 'rb') as page:
+                write_response(writer, HTTPStatus.OK, page.read(), 'text/html; charset=utf-8')
+        elif method == 'GET' and path == '/stats':
+            stats = dict(service.stats, cached=len(service.cache), in_flight=len(service.in_flight))
+            write_response(writer, HTTPStatus.OK, json_body(stats))
+        elif method == 'POST' and path == '/solve':
+            try:
+                try:
+                    key = await service.parse(body)
+                except ValueError as error:  # Malformed payload
+                    write_response(writer, HTTPStatus.BAD_REQUEST, json_body({'error': str(error)}))
+                    return
+                result = await service.solve(key)
+            except Exception as error:  # Worker failures such as BrokenProcessPool or MemoryError
+                write_response(writer, HTTPStatus.INTERNAL_SERVER_ERROR, json_body({'error': repr(error)}))
+                return
+            write_response(writer, HTTPStatus.OK, json_body(result))
+        else:
+            write_response(writer, HTTPStatus.NOT_FOUND, json_body({'error': 'not found'}))
+    finally:
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+
+async def serve(host, port, workers=None, cache_size=256):
+    with ProcessPoolExecutor(max_workers=workers or DEFAULT_WORKERS) as executor:
+        service = SolveService(executor, cache_size)
+        server = await asyncio.start_server(
+            lambda reader, writer: handle_connection(service, reader, writer), host, port)
+        print(f"Solve service listening on http://{host}:{port}/")
+        async with server:
+            await server.serve_forever()
+
+
+def solve_server_main(host='127.0.0.1', port=8765, workers=None, cache_size=256):
+    try:
+        asyncio.run(serve(host, port, workers, cache_size))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Local JSON solve service for visualize.html')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count, at most 4)')
+    parser.add_argument('--cache-size', type=int, default=256, help='Number of recent grids to cache')
+    args = parser.parse_args()
+    solve_server_main(args.host, args.port, args.workers, args.cache_size)
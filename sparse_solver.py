@@ -0,0 +1,143 @@
+from bisect import bisect_left, bisect_right
+from grid import Grid
+from nested_obstacles import solve_best_path
+
+# Minimum turn counts up to this are answered from the obstacle list alone
+MAX_SPARSE_TURNS = 3
+
+
+def _index_obstacles(obstacles):
+    """
+    Returns ({row: sorted obstacle columns}, {column: sorted obstacle rows}).
+    """
+    by_row, by_col = {}, {}
+    for i, j in obstacles:
+        by_row.setdefault(i, []).append(j)
+        by_col.setdefault(j, []).append(i)
+    for line in by_row.values():
+        line.sort()
+    for line in by_col.values():
+        line.sort()
+    return by_row, by_col
+
+
+def _line_clear(line, lo, hi):
+    """
+    True when the sorted obstacle coordinates of one row/column have none in
+    [lo, hi].
+    """
+    if not line:
+        return True
+    return bisect_left(line, lo) == bisect_right(line, hi)
+
+
+def _count_right_first(n, by_row, by_col, turns):
+    """
+    Number of paths with exactly `turns` turns (1 to 3) whose first move is
+    right. Paths starting down are counted by swapping by_row and by_col,
+    which transposes the grid.
+    """
+    first_in_top_row = by_row[0][0] if 0 in by_row else n
+    if turns == 1:
+        # Along the top row, then down the last column
+        return int(first_in_top_row == n and _line_clear(by_col.get(n - 1), 0, n - 1))
+
+    if turns == 2:
+        # Right to column c, down the whole of column c, right along the bottom row
+        last_in_bottom_row = by_row[n - 1][-1] if n - 1 in by_row else -1
+        lo, hi = max(1, last_in_bottom_row + 1), min(n - 2, first_in_top_row - 1)
+        if lo > hi:
+            return 0
+        obstacle_cols = sorted(by_col)
+        return (hi - lo + 1) - (bisect_right(obstacle_cols, hi) - bisect_left(obstacle_cols, lo))
+
+    # Three turns: right to column c, down to row r, right to the last column,
+    # down to the end. Valid pairs need
+    #   c < first obstacle of the top row,   r < first obstacle of column c,
+    #   c > last obstacle of row r,          r > last obstacle of the last column.
+    # Sweep c upwards; row r becomes usable once c passes its last obstacle.
+    # Columns and rows without obstacles behave identically, so c only needs
+    # to be evaluated at breakpoints, and rows are split into obstacle-free
+    # ones (counted arithmetically) and obstacle rows (a Fenwick tree).
+    last_in_last_col = by_col[n - 1][-1] if n - 1 in by_col else -1
+    c_lo, c_hi = 1, min(n - 2, first_in_top_row - 1)
+    r_lo = max(1, last_in_last_col + 1)
+    if c_lo > c_hi or r_lo > n - 2:
+        return 0
+
+    obstacle_rows = sorted(by_row)
+    activations = sorted((by_row[r][-1] + 1, idx) for idx, r in enumerate(obstacle_rows))
+    breakpoints = {c_lo, c_hi + 1}
+    for c in by_col:
+        if c_lo <= c <= c_hi:
+            breakpoints.update((c, c + 1))
+    for c, _ in activations:
+        if c_lo < c <= c_hi:
+            breakpoints.add(c)
+    breakpoints = sorted(breakpoints)
+
+    tree = [0] * (len(obstacle_rows) + 1)
+    activated = 0
+    total = 0
+    for c, next_c in zip(breakpoints, breakpoints[1:]):
+        while activated < len(activations) and activations[activated][0] <= c:
+            _fenwick_add(tree, activations[activated][1])
+            activated += 1
+        col = by_col.get(c)
+        r_hi = min(n - 2, (col[0] if col else n) - 1)
+        if r_lo > r_hi:
+            continue
+        lo_idx, hi_idx = bisect_left(obstacle_rows, r_lo), bisect_right(obstacle_rows, r_hi)
+        free_rows = (r_hi - r_lo + 1) - (hi_idx - lo_idx)
+        usable_rows = free_rows + _fenwick_sum(tree, hi_idx) - _fenwick_sum(tree, lo_idx)
+        # Every column in [c, next_c) is either c itself or obstacle-free
+        total += usable_rows * (next_c - c)
+    return total
+
+
+def _fenwick_add(tree, idx):
+    idx += 1
+    while idx < len(tree):
+        tree[idx] += 1
+        idx += idx & -idx
+
+
+def _fenwick_sum(tree, idx):
+    """
+    Sum of the first idx entries.
+    """
+    total = 0
+    while idx > 0:
+        total += tree[idx]
+        idx -= idx & -idx
+    return total
+
+
+def sparse_best_paths(n, obstacles):
+    """
+    Returns (best_path_count, min_turns) for an n x n grid described only by
+    its obstacle coordinates, or (0, None) when no path exists. Minimum turn
+    counts up to MAX_SPARSE_TURNS are found by checking candidate turn points
+    against per-row/per-column obstacle indexes in O(k log k) for k obstacles,
+    independent of n. Grids needing more turns fall back to the dense solver.
+    """
+    obstacles = [(int(i), int(j)) for i, j in obstacles]
+    blocked_ends = {(0, 0), (n - 1, n - 1)}
+    if any(pos in blocked_ends for pos in obstacles):
+        return 0, None
+    if n == 1:
+        return 1, 0  # Start is the end
+
+    by_row, by_col = _index_obstacles(obstacles)
+    for turns in range(1, MAX_SPARSE_TURNS + 1):
+        best_path_count = (_count_right_first(n, by_row, by_col, turns) +
+                           _count_right_first(n, by_col, by_row, turns))
+        if best_path_count:
+            return best_path_count, turns
+
+    # Too many turns needed to enumerate turn points; solve the dense grid
+    grid = Grid(n)
+    for i, j in obstacles:
+        grid.block(i, j)
+    best_path_count, min_turns, _ = solve_best_path(grid)
+    return best_path_count, min_turns
@@ -0,0 +1,121 @@
+import multiprocessing
+import os
+import time
+from collections import deque, namedtuple
+from multiprocessing.connection import wait
+
+try:
+    import resource  # Unix only; memory limits are skipped without it
+except ImportError:
+    resource = None
+
+# status is 'ok', 'timeout', 'oom', 'crashed', 'error' or 'skipped'; value is
+# whatever the target returned, or the exception's repr for 'error'; peak_rss
+# is the worker's peak resident set in bytes
+CellResult = namedtuple('CellResult', ['status', 'value', 'peak_rss'])
+
+# Outcomes that mean the method is over budget; 'error' is a solver bug, not censoring
+CENSORED = ('timeout', 'oom', 'crashed')
+
+
+def _peak_rss():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # ru_maxrss is in KiB on Linux
+
+
+def _run_cell(target, cell, memory_limit, conn):
+    """
+    Worker process body: caps the address space, runs one cell and sends back
+    ('ok' | 'oom' | 'error', value, peak_rss).
+    """
+    if resource is not None and memory_limit:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    try:
+        conn.send(('ok', target(*cell), _peak_rss()))
+    except MemoryError:
+        conn.send(('oom', None, _peak_rss()))
+    except Exception as error:
+        conn.send(('error', repr(error), _peak_rss()))
+    finally:
+        conn.close()
+
+
+def run_sweep(target, cells, time_limits, memory_limits=None, workers=None):
+    """
+    Runs target(*cell) for every cell in its own worker process and returns
+    {cell: CellResult}. Cells are tuples starting with (method, n, ...).
+
+    time_limits and memory_limits map a method to its wall-clock budget in
+    seconds and its address-space budget in bytes. A worker over its time
+    budget is killed and recorded as 'timeout'; one that runs out of memory
+    is recorded as 'oom', and one that dies without answering (for example a
+    stack overflow) as 'crashed'. A cell whose target raises any other
+    exception is recorded as 'error' with the exception's repr as its value;
+    errors are not censoring. Once a method is censored at some n, its cells
+    with larger n are not started and are recorded as 'skipped'.
+    Independent cells run in parallel on up to `workers` processes.
+    """
+    memory_limits = memory_limits or {}
+    workers = workers or os.cpu_count() or 1
+    # Smallest sizes first, so budgets are hit before larger sizes are launched
+    pending = deque(sorted(cells, key=lambda cell: cell[1]))
+    running = {}  # conn -> (process, cell, deadline)
+    censored_at = {}  # method -> smallest censored n
+    results = {}
+
+    while pending or running:
+        while pending and len(running) < workers:
+            cell = pending.popleft()
+            method, n = cell[0], cell[1]
+            if method in censored_at and n > censored_at[method]:
+                results[cell] = CellResult('skipped', None, None)
+                continue
+            recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(
+                target=_run_cell, args=(target, cell, memory_limits.get(method), send_conn), daemon=True)
+            process.start()
+            send_conn.close()  # Only the worker writes
+            running[recv_conn] = (process, cell, time.monotonic() + time_limits[method])
+
+        if not running:
+            continue
+        timeout = max(0.0, min(deadline for _, _, deadline in running.values()) - time.monotonic())
+        ready = wait(list(running), timeout)
+
+        now = time.monotonic()
+        for conn in list(running):
+            if conn not in running:
+                continue  # Stopped below as a larger size of a censored method
+            process, cell, deadline = running[conn]
+            if conn in ready:
+                try:
+                    status, value, peak_rss = conn.recv()
+                except EOFError:
+                    process.join()  # Died without answering
+                    status, value, peak_rss = 'crashed', None, None
+                else:
+                    process.join()
+            elif now >= deadline:
+                process.kill()
+                process.join()
+                status, value, peak_rss = 'timeout', None, None
+            else:
+                continue
+            conn.close()
+            del running[conn]
+            results[cell] = CellResult(status, value, peak_rss)
+            if status in CENSORED:
+                method, n = cell[0], cell[1]
+                censored_at[method] = min(n, censored_at.get(method, n))
+                # Larger sizes of the same method already in flight are stopped too
+                for other_conn in list(running):
+                    other_process, other_cell, _ = running[other_conn]
+                    if other_cell[0] == method and other_cell[1] > censored_at[method]:
+                        other_process.kill()
+                        other_process.join()
+                        other_conn.close()
+                        del running[other_conn]
+                        results[other_cell] = CellResult('skipped', None, None)
+
+    return results